@@ -1,15 +1,29 @@
 """Implementation of 2 sided CI of treatment effect."""
 
+import functools
 import math
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-import scipy as sp
-from scipy.special import comb
-from itertools import filterfalse, combinations
+from itertools import chain, combinations
 from scipy.stats import hypergeom
 
+try:
+    from numba import njit, prange
+except ImportError:      # numba is optional; fall back to pure NumPy
+    njit = prange = None
+
+
+# below this many mask elements (C(N,n) * N) the transfer and launch
+# overhead of the GPU path outweighs the matmul it accelerates
+_GPU_MIN_SIZE = 10**6
+
 
 def tau_twosided_ci(n11, n10, n01, n00, alpha, exact=True,
-                    max_combinations=10**5, reps=10**3):
+                    max_combinations=10**5, reps=10**3, workers=None,
+                    seed=None, backend='cpu'):
     """
     Find 2-sided 1−alpha confidence bounds for the average treatment effect.
 
@@ -29,14 +43,27 @@ def tau_twosided_ci(n11, n10, n01, n00, alpha, exact=True,
         number of subjects assigned to treatment 0 who had outcome 0
     alpha : float in (0, 1)
         The desired type 1 error level.
-    exact: boolean
+    exact: boolean or 'auto'
         Whether to compute exact result. If true, sampling distributions are
         computed by enumerating all possible samples. If false, simulations
-        are used to approximate the sampling distribution.
+        are used to approximate the sampling distribution. 'auto' picks
+        whichever is cheaper: enumeration whenever there are at most `reps`
+        possible samples (which is then also exact), simulation otherwise.
     max_combinations: int
         Maximum amount of combinations to sample per table if exact=True
     reps: int
         Number of samples to generate if exact=False
+    workers: int or None
+        Number of worker processes used to test candidate tables. Defaults
+        to the number of CPUs; 1 runs sequentially. (The compiled exact
+        kernel parallelizes with threads on its own and ignores this.)
+    seed: int, SeedSequence, or None
+        Seed for the random sampling when exact=False. With a fixed seed
+        results are reproducible regardless of the number of workers.
+    backend: {'cpu', 'gpu'}
+        Where to evaluate the exact branch. 'gpu' requires cupy and is
+        only engaged when the problem is large enough to amortize the
+        device transfers; small problems fall back to the CPU path.
 
     Returns
     -------
@@ -45,62 +72,436 @@ def tau_twosided_ci(n11, n10, n01, n00, alpha, exact=True,
         [allocation that gives lb, allocation that gives ub],
         [# tables examined, total reps across simulations]
     """
+    # validate before any arithmetic on the counts
+    if backend not in ('cpu', 'gpu'):
+        raise ValueError("backend must be 'cpu' or 'gpu'!")
+    if ((alpha <= 0) or (alpha >= 1)):
+        raise ValueError("Invalid value for alpha!")
+    if (n11 < 0) or (n10 < 0) or (n01 < 0) or (n00 < 0):
+        raise ValueError("subject count cannot be negative!")
+
     N = n11 + n10 + n01 + n00
     n = n11 + n10                     # size of treatment sample
-    t_star = n11/n - n01/(N-n)        # unbiased estimate of tau
-
-
-    n_combs = comb(N, n, exact=True)  # total number of samples for exact ans
-    if exact and n_combs > max_combinations:
+    n_ctrl = N - n                    # size of control sample
+    t_star = n11/n - n01/n_ctrl       # unbiased estimate of tau
+
+    n_combs = math.comb(N, n)         # total number of samples for exact ans
+    if exact == 'auto':
+        # enumeration is exact and no more work than simulating whenever
+        # there are at most reps samples; unlike an explicit exact=True,
+        # blowing past max_combinations falls back to sampling
+        if n_combs > max_combinations:
+            if n_combs <= reps:
+                warnings.warn(f"{n_combs} combinations exceed "
+                              f"max_combinations; falling back to "
+                              f"simulation.")
+            exact = False
+        else:
+            exact = n_combs <= reps
+    elif exact and n_combs > max_combinations:
         raise ValueError(f"Please raise max_combinations to {n_combs} for \
                           exact solution.")
 
-    if ((alpha <= 0) or (alpha >= 1)):
-        raise ValueError("Invalid value for alpha!")
-    if (n11 < 0) or (n10 < 0) or (n01 < 0) or (n00 < 0):
-        raise ValueError("subject count cannot be negative!")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    tables = list(N_generator(N, n00, n01, n10, n11))
+    # Tables sharing N01 - N10 share tau, and tau enters the confidence
+    # set as soon as any one of them is accepted - so group them and let
+    # each group stop at its first accepted member.
+    groups = {}
+    for Nt in tables:
+        groups.setdefault(Nt[1] - Nt[2], []).append(Nt)
+    group_list = list(groups.values())
+
+    if exact:
+        # The sample index array depends only on (N, n), not on the table
+        # under test, so build it once and reuse it for every candidate.
+        combs = _get_combs(N, n)
+        # prefix[r, k] = how many of sample r's n indices are < k.  Because
+        # potential_outcomes lays subjects out in contiguous blocks
+        # [N00 | N01 | N10 | N11], the dot products with the outcome columns
+        # reduce to a few prefix lookups per table instead of two
+        # (C(N,n) x N) matrix multiplies.  Built straight from the index
+        # array: the dense (C(N,n), N) boolean mask is never materialized.
+        prefix = np.zeros((n_combs, N+1), dtype=np.int16)
+        prefix[np.arange(n_combs)[:, None], combs + 1] = 1
+        np.cumsum(prefix, axis=1, out=prefix)
+
+        if backend == 'gpu' and n_combs * N >= _GPU_MIN_SIZE:
+            results = _eval_groups_gpu(group_list, t_star, N, n, alpha,
+                                       combs)
+        elif _exact_kernel is not None:
+            flat = [Nt for group in group_list for Nt in group]
+            tables_arr = np.asarray(flat, dtype=np.int64)
+            starts = np.zeros(len(group_list) + 1, dtype=np.int64)
+            np.cumsum([len(g) for g in group_list], out=starts[1:])
+            chosen, examined = _exact_kernel(tables_arr, starts, prefix,
+                                             float(t_star), float(alpha),
+                                             N, n)
+            results = [((g[0][1] - g[0][2])/N,
+                        flat[chosen[gi]] if chosen[gi] >= 0 else None,
+                        int(examined[gi]))
+                       for gi, g in enumerate(group_list)]
+        else:
+            args = [(group, t_star, N, n, alpha, True, reps, None)
+                    for group in group_list]
+            results = _map_groups(args, workers, prefix)
+
+    else:
+        # one child seed per table, so results do not depend on how tables
+        # are distributed across workers
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        seeds = seed.spawn(len(tables))
+        args = []
+        pos = 0
+        for group in group_list:
+            args.append((group, t_star, N, n, alpha, False, reps,
+                         seeds[pos:pos + len(group)]))
+            pos += len(group)
+        results = _map_groups(args, workers, None)
 
     conf_set = {}
-    n_tables, n_reps = 0, 0
+    n_tables = 0
+    for tau, Nt, examined in results:
+        n_tables += examined
+        if Nt is not None:
+            conf_set[tau] = Nt
+    n_reps = (n_combs if exact else reps) * n_tables
+
+    lower, upper = min(conf_set.keys()), max(conf_set.keys())
+    lower_alloc, upper_alloc = conf_set[lower], conf_set[upper]
+    return ([lower, upper], [lower_alloc, upper_alloc], [n_tables, n_reps])
 
-    for Nt in N_generator(N, n00, n01, n10, n11):
-        table = potential_outcomes(Nt)    # generate potential outcomes table
-        tau = (Nt[1]-Nt[2])/N             # average treatment effect for table
-        t = abs(t_star - tau)             # test statistic
 
-        if exact:
-            # generate samples
-            mask = np.zeros((n_combs, N), dtype=bool)
-            for i, sample in enumerate(combinations(range(N), n)):
-                mask[i, sample] = True
+@functools.lru_cache(maxsize=16)
+def _get_combs(N, n):
+    """
+    All n-subsets of range(N), as a (C(N,n), n) int16 index array.
 
-            # calculate test statistic for each sample
-            tau_hat = mask.dot(table[:, 1])/n - (~mask).dot(table[:, 0])/(N-n)
-            dist = abs(tau_hat-tau)
-            n_reps += n_combs
+    The enumeration depends only on (N, n), so it is memoized at module
+    level and persisted under ~/.cache/cibin: repeated calls, and repeated
+    runs, skip the Python-level sweep over itertools.combinations.
+    Callers must treat the returned array as read-only.
+    """
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "cibin")
+    cache_file = os.path.join(cache_dir, "combs_{}_{}.npy".format(N, n))
+    try:
+        return np.load(cache_file)
+    except (OSError, ValueError):
+        pass
+    n_combs = math.comb(N, n)
+    combs = np.fromiter(chain.from_iterable(combinations(range(N), n)),
+                        dtype=np.int16, count=n_combs*n).reshape(n_combs, n)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(cache_file, combs)
+    except OSError:
+        pass
+    return combs
+
+
+if hasattr(np, "bitwise_count"):    # numpy >= 2.0: hardware popcount ufunc
+    _popcount = np.bitwise_count
+else:
+    _popcount_table = np.array([bin(v).count("1") for v in range(256)],
+                               dtype=np.uint8)
+
+    def _popcount(a):
+        """Per-byte population count via a 256-entry lookup table."""
+        return _popcount_table[a]
+
+
+def _quantile(dist, alpha):
+    """
+    The (1 - alpha) quantile of `dist`, without fully sorting it.
 
-            # include in confidence set if t is within confidence bounds
-            if t <= np.percentile(dist, (1-alpha)*100):
-                conf_set[tau] = Nt
+    Matches np.percentile(dist, (1-alpha)*100) with the default linear
+    interpolation, but finds the two order statistics it needs with an
+    O(M) partition instead of an O(M log M) sort.
+    """
+    M = dist.size
+    h = (M - 1) * (((1.0 - alpha) * 100.0) / 100.0)
+    k = int(np.floor(h))
+    frac = h - k
+    part = np.partition(dist, k)
+    d_lo = part[k]
+    if frac == 0.0 or k + 1 >= M:
+        return d_lo
+    d_hi = part[k+1:].min()
+    if frac >= 0.5:
+        return d_hi - (d_hi - d_lo)*(1.0 - frac)
+    return d_lo + (d_hi - d_lo)*frac
+
+
+def _accept(dist, t, alpha):
+    """
+    Whether t falls at or below the (1 - alpha) quantile of dist.
+
+    Counts entries strictly below t instead of locating the quantile:
+    with h = (M-1)*(1-alpha) and k = floor(h), t is at or below the k-th
+    order statistic iff at most k entries are smaller, and strictly above
+    the (k+1)-th iff at least k+2 are. Only the in-between case needs the
+    interpolated quantile itself. The count runs in chunks and bails out
+    as soon as rejection is certain, so clear rejects - the common case
+    near the edges of the candidate-table grid - touch only a fraction
+    of dist.
+    """
+    M = dist.size
+    h = (M - 1) * (((1.0 - alpha) * 100.0) / 100.0)
+    k = int(np.floor(h))
+    below = 0
+    for start in range(0, M, 8192):
+        below += np.count_nonzero(dist[start:start+8192] < t)
+        if below > k + 1:
+            return False
+    if below <= k:
+        return True
+    return t <= _quantile(dist, alpha)
+
+
+def _init_pool(prefix):
+    """Make the shared prefix-count table visible inside a worker process."""
+    global _pool_prefix
+    _pool_prefix = prefix
+
+
+def _eval_group(args):
+    """
+    Confidence-set membership test for one tau-equivalence class.
 
+    All tables in the group share tau = (N01 - N10)/N, and tau belongs to
+    the confidence set as soon as any one of them is accepted, so the
+    scan stops at the first accepted member. Module-level so groups can
+    be dispatched to worker processes; groups are independent, which
+    makes the loop over them embarrassingly parallel.
+
+    Parameters
+    ----------
+    args : tuple
+        (group, t_star, N, n, alpha, exact, reps, seeds); `group` is a
+        list of tables sharing tau and `seeds` their per-table
+        SeedSequences, used only when exact is False.
+
+    Returns
+    -------
+    (tau, Nt, examined) : tuple
+        the group's average treatment effect, the first accepted table
+        (None if every member is rejected), and how many members were
+        tested
+    """
+    group, t_star, N, n, alpha, exact, reps, seeds = args
+    tau = (group[0][1] - group[0][2])/N
+    t = abs(t_star - tau)
+
+    # preallocate the per-table work buffers once per group and fill them
+    # in place: for the exact branch these are O(C(N,n)) float64 arrays,
+    # and churning fresh ones through the allocator for every table costs
+    # more than the arithmetic
+    if exact:
+        prefix = _pool_prefix
+        tau_hat = np.empty(prefix.shape[0])
+        dist = np.empty(prefix.shape[0])
+    else:
+        u = np.empty((reps, N))
+        packed = np.empty((reps, (N + 7)//8), dtype=np.uint8)
+        rows = np.arange(reps)[:, None]
+
+    for gi, Nt in enumerate(group):
+        if exact:
+            # count, per sample, how many indices land in each block:
+            # s1 = (prefix_b - prefix_a) + (n - prefix_c) treated ones,
+            # n - prefix_b sampled control ones
+            a = Nt[0]
+            b = a + Nt[1]
+            c = b + Nt[2]
+            np.subtract(prefix[:, b], prefix[:, c], out=tau_hat)
+            tau_hat -= prefix[:, a]
+            tau_hat += n
+            tau_hat /= n
+            np.add(prefix[:, b], Nt[2] + Nt[3] - n, out=dist)
+            dist /= N - n
+            tau_hat -= dist
         else:
-            mask = np.zeros((reps, N), dtype=bool)
-            for i in range(reps):
-                sample = np.random.choice(range(N), n, replace=False)
-                mask[i, sample] = True
+            po_ctrl, po_trt = potential_outcomes(Nt)
+            # draw all reps at once: the n smallest of N uniforms per row
+            # is a uniform random n-subset of range(N)
+            rng = np.random.default_rng(seeds[gi])
+            rng.random(out=u)
+            sample_idx = np.argpartition(u, n, axis=1)[:, :n]
+            # bit-pack the sample masks (one bit per subject instead of
+            # one byte); a dot product with a 0/1 outcome vector is then
+            # just a popcount of the ANDed lanes
+            packed[:] = 0
+            bits = (1 << (7 - (sample_idx & 7))).astype(np.uint8)
+            np.bitwise_or.at(packed, (rows, sample_idx >> 3), bits)
+            s1 = _popcount(packed & np.packbits(po_trt)).sum(axis=1)
+            s0 = _popcount(packed & np.packbits(po_ctrl)).sum(axis=1)
+            tau_hat = s1/n - (int(po_ctrl.sum()) - s0)/(N-n)
+            dist = tau_hat
+
+        np.subtract(tau_hat, tau, out=dist)
+        np.abs(dist, out=dist)
+        if _accept(dist, t, alpha):
+            return tau, Nt, gi + 1
+
+    return tau, None, len(group)
+
+
+def _eval_groups_gpu(group_list, t_star, N, n, alpha, combs):
+    """
+    Evaluate all tau groups on the GPU with cupy.
 
-            tau_hat = mask.dot(table[:, 1])/n - (~mask).dot(table[:, 0])/(N-n)
-            dist = abs(tau_hat-tau)
-            n_reps += reps
+    The sample mask depends only on (N, n), so it is built on-device once
+    and stays resident for every table; only the two length-N potential
+    outcome vectors are transferred per table. The whole per-table
+    pipeline (matmul, abs, percentile) runs on-device. Requires cupy;
+    raises ImportError when it is not installed.
 
-            if t <= np.percentile(dist, (1-alpha)*100):
-                conf_set[tau] = Nt
+    Returns the same (tau, Nt, examined) triples as `_eval_group`.
+    """
+    import cupy as cp
+    n_combs, n_sel = combs.shape
+    mask = cp.zeros((n_combs, N), dtype=cp.float64)
+    mask[cp.repeat(cp.arange(n_combs), n_sel),
+         cp.asarray(combs.ravel(), dtype=cp.int64)] = 1.0
+    q = (1 - alpha) * 100
+    results = []
+    for group in group_list:
+        tau = (group[0][1] - group[0][2])/N
+        t = abs(t_star - tau)
+        chosen = None
+        examined = 0
+        for Nt in group:
+            po_ctrl, po_trt = potential_outcomes(Nt)
+            trt_g = cp.asarray(po_trt, dtype=cp.float64)
+            ctrl_g = cp.asarray(po_ctrl, dtype=cp.float64)
+            tau_hat = (mask @ trt_g)/n \
+                - (float(po_ctrl.sum()) - mask @ ctrl_g)/(N-n)
+            dist = cp.abs(tau_hat - tau)
+            examined += 1
+            if t <= float(cp.percentile(dist, q)):
+                chosen = Nt
+                break
+        results.append((tau, chosen, examined))
+    return results
+
+
+def _map_groups(args, workers, prefix):
+    """
+    Run `_eval_group` over all argument tuples, in parallel if asked.
 
-        n_tables += 1
+    Uses processes rather than threads because the work is CPU-bound
+    Python/NumPy. Falls back to a plain sequential map when workers == 1
+    or there is nothing to parallelize.
+    """
+    if workers == 1 or len(args) < 2:
+        _init_pool(prefix)
+        return [_eval_group(a) for a in args]
+    chunksize = max(1, len(args)//(4*workers))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool,
+                             initargs=(prefix,)) as ex:
+        return list(ex.map(_eval_group, args, chunksize=chunksize))
+
+
+def _exact_kernel_impl(tables, starts, prefix, t_star, alpha, N, n):
+    """
+    Decide confidence-set membership for every tau group at once.
+
+    Compiled inner loop for the exact branch of `tau_twosided_ci`.
+    `tables` holds the candidates ordered group-by-group, with group g
+    occupying rows starts[g]:starts[g+1]; all rows of a group share tau,
+    and the scan of a group stops at its first accepted member. Groups
+    are independent, so the outer loop is parallelized across cores. The
+    quantile is taken with a partition-based order statistic (linear
+    interpolation, matching np.percentile) instead of a full sort.
+
+    Parameters
+    ----------
+    tables : int64 array of shape (n_tables, 4)
+        candidate tables (N00, N01, N10, N11), grouped by N01 - N10
+    starts : int64 array of shape (n_groups + 1,)
+        row offsets of the groups within `tables`
+    prefix : int16 array of shape (n_combs, N+1)
+        prefix[r, k] = how many of sample r's n indices are < k
+    t_star : float
+        observed value of the test statistic
+    alpha : float in (0, 1)
+        The desired type 1 error level.
+    N : int
+        number of subjects
+    n : int
+        size of the treatment sample
+
+    Returns
+    -------
+    chosen : int64 array of shape (n_groups,)
+        row index of the first accepted table per group, -1 if none
+    examined : int64 array of shape (n_groups,)
+        number of tables actually tested per group
+    """
+    n_groups = starts.shape[0] - 1
+    M = prefix.shape[0]
+    chosen = np.full(n_groups, -1, dtype=np.int64)
+    examined = np.zeros(n_groups, dtype=np.int64)
+    h = (M - 1) * (((1.0 - alpha) * 100.0) / 100.0)
+    k = int(np.floor(h))
+    frac = h - k
+    for gi in prange(n_groups):
+        first = starts[gi]
+        tau = (tables[first, 1] - tables[first, 2]) / N
+        t = abs(t_star - tau)
+        dist = np.empty(M)
+        for ti in range(first, starts[gi+1]):
+            a = tables[ti, 0]
+            b = a + tables[ti, 1]
+            c = b + tables[ti, 2]
+            ones_ctrl = tables[ti, 2] + tables[ti, 3]
+            # count entries strictly below t, bailing out once rejection
+            # is certain; only the boundary count k+1 needs the
+            # interpolated quantile (see _accept)
+            below = 0
+            rejected = False
+            for r in range(M):
+                s1 = prefix[r, b] - prefix[r, a] + (n - prefix[r, c])
+                s0 = n - prefix[r, b]
+                d = abs(s1/n - (ones_ctrl - s0)/(N-n) - tau)
+                dist[r] = d
+                if d < t:
+                    below += 1
+                    if below > k + 1:
+                        rejected = True
+                        break
+            examined[gi] += 1
+            if rejected:
+                continue
+            if below <= k:
+                accepted = True
+            else:
+                part = np.partition(dist, k)
+                d_lo = part[k]
+                if frac > 0.0 and k + 1 < M:
+                    d_hi = part[k+1:].min()
+                    # same linear interpolation (and rounding behavior)
+                    # as np.percentile's default method
+                    if frac >= 0.5:
+                        q = d_hi - (d_hi - d_lo)*(1.0 - frac)
+                    else:
+                        q = d_lo + (d_hi - d_lo)*frac
+                else:
+                    q = d_lo
+                accepted = t <= q
+            if accepted:
+                chosen[gi] = ti
+                break
+    return chosen, examined
 
-    lower, upper = min(conf_set.keys()), max(conf_set.keys())
-    lower_alloc, upper_alloc = conf_set[lower], conf_set[upper]
-    return ([lower, upper], [lower_alloc, upper_alloc], [n_tables, n_reps])
+
+if njit is not None:
+    _exact_kernel = njit(parallel=True, cache=True)(_exact_kernel_impl)
+else:
+    _exact_kernel = None
 
 
 def N_generator(N, n00, n01, n10, n11):
@@ -131,17 +532,20 @@ def N_generator(N, n00, n01, n10, n11):
     N10, subjects with potential outcome 1 under control and 0 under treatment
     N11, subjects with potential outcome 1 under control and treatment
     """
-    for i in range(N):
-        N00 = i
-        for j in range(N-i):
-            N01 = j
-            for k in range(N-i-j):
-                N10 = k
-                N11 = N-i-j-k
-                if filterTable([N00, N01, N10, N11], n00, n01, n10, n11):
-                    yield [N00, N01, N10, N11]
-                else:
-                    pass
+    # Enumerate all O(N^3) candidate tables in one vectorized pass rather
+    # than three nested Python loops with a filterTable call per candidate.
+    # The bounds below inline the Li & Ding (2016) Theorem 1 test that
+    # filterTable implements for a single table.
+    i, j, k = np.mgrid[0:N, 0:N, 0:N]
+    keep = (i + j + k) < N
+    i, j, k = i[keep], j[keep], k[keep]
+    N11 = N - i - j - k
+    lo = np.maximum.reduce([np.zeros_like(i), n11 - j, N11 - n01,
+                            k + N11 - n10 - n01])
+    hi = np.minimum.reduce([N11, np.full_like(N11, n11), k + N11 - n01,
+                            N - j - n01 - n10])
+    ok = lo <= hi
+    yield from np.stack([i[ok], j[ok], k[ok], N11[ok]], axis=1).tolist()
 
 
 def filterTable(Nt, n00, n01, n10, n11):
@@ -171,23 +575,36 @@ def filterTable(Nt, n00, n01, n10, n11):
     --------
     ok : boolean
         True if table is consistent with the data
-
-    '''
-    
-    if sum(Nt) < (n00 + n01 + n10 + n11):
-
-        raise ValueError("Number of subjects do not match!")
-
+    """
     if (n11 < 0) or (n10 < 0) or (n01 < 0) or (n00 < 0):
         raise ValueError("subject count cannot be negative!")
-    N = np.sum(Nt)   # total subjects
-    return max(0, n11-Nt[1], Nt[3]-n01, Nt[2]+Nt[3]-n10-n01) <= \
-        min(Nt[3], n11, Nt[2]+Nt[3]-n01, N-Nt[1]-n01-n10)
+    N00, N01, N10, N11 = Nt
+    N = N00 + N01 + N10 + N11   # total subjects
+    if N < (n00 + n01 + n10 + n11):
+        raise ValueError("Number of subjects do not match!")
+
+    # plain integer arithmetic throughout: no NumPy dispatch for what is
+    # a handful of scalar comparisons
+    lo = n11 - N01
+    if lo < 0:
+        lo = 0
+    if N11 - n01 > lo:
+        lo = N11 - n01
+    if N10 + N11 - n10 - n01 > lo:
+        lo = N10 + N11 - n10 - n01
+    hi = N11
+    if n11 < hi:
+        hi = n11
+    if N10 + N11 - n01 < hi:
+        hi = N10 + N11 - n01
+    if N - N01 - n01 - n10 < hi:
+        hi = N - N01 - n01 - n10
+    return lo <= hi
 
 
 def potential_outcomes(Nt):
     """
-    make a 2xN table of potential outcomes from the 2x2 summary table Nt.
+    make the potential outcome vectors for the 2x2 summary table Nt.
 
     Parameters
     ----------
@@ -196,7 +613,9 @@ def potential_outcomes(Nt):
 
     Returns
     -------
-    po : Nx2 table of potential outcomes consistent with Nt
+    po_ctrl, po_trt : two int8 arrays of length N
+        potential outcomes under control and under treatment, laid out in
+        contiguous blocks [N00 | N01 | N10 | N11]
     """
     if len(Nt) != 4:
         raise ValueError("Table size must be 4: N00, N01, N10, N11 ")
@@ -205,8 +624,36 @@ def potential_outcomes(Nt):
         if Nt[i] < 0:
             raise ValueError("Cannot have a " +
                              "negative number as a potential outcome")
-    return np.reshape(np.array([0, 0] * Nt[0] + [0, 1] * Nt[1] +
-                               [1, 0] * Nt[2] + [1, 1] * Nt[3]), [-1, 2])
+    # Two small int8 vectors instead of one Nx2 int64 table: downstream
+    # code only ever uses the columns separately, and slice assignment
+    # avoids building a 2N-element Python list first.
+    a = Nt[0]
+    b = a + Nt[1]
+    c = b + Nt[2]
+    N = c + Nt[3]
+    po_ctrl = np.zeros(N, dtype=np.int8)
+    po_trt = np.zeros(N, dtype=np.int8)
+    po_trt[a:b] = 1
+    po_ctrl[b:] = 1
+    po_trt[c:] = 1
+    return po_ctrl, po_trt
+
+
+def _bisect_least(lo, hi, pred):
+    """
+    Smallest integer in [lo, hi] for which pred is true.
+
+    `pred` must be monotone on the range (all False up to some point,
+    then all True) and true at `hi`; the crossover is found with
+    O(log(hi - lo)) evaluations.
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if pred(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
 
 
 def hypergeom_accept(N, G, n, cl=0.975, randomized=False):
@@ -243,7 +690,9 @@ def hypergeom_accept(N, G, n, cl=0.975, randomized=False):
 
     alpha = 1 - cl
     prob = np.arange(0, n+1)
-    I = list(prob)
+    # membership flags instead of a list with O(n) removals: list.remove
+    # inside the loop below made the whole routine O(n^2)
+    kept = np.ones(n+1, dtype=bool)
     pmf = hypergeom.pmf(prob, N, G, n)
     bottom = 0
     top = n
@@ -273,13 +722,13 @@ def hypergeom_accept(N, G, n, cl=0.975, randomized=False):
                 bottom += 1
         prob_tail += prob_J
         for j in J:
-            I.remove(j)
+            kept[j] = False
     if randomized == False:
         while prob_tail > alpha:
             j = J.pop()
             prob_tail -= pmf[j]
-            I.append(j)
-    return I
+            kept[j] = True
+    return prob[kept].tolist()
 
 
 def hypergeom_conf_interval(n, x, N, cl=0.975, alternative="two-sided", G=None):
@@ -326,31 +775,38 @@ def hypergeom_conf_interval(n, x, N, cl=0.975, alternative="two-sided", G=None):
     ci_low = 0
     ci_upp = N
 
+    # The tail probabilities below are monotone in G, so every search is a
+    # bisection: O(log N) survival-function (or acceptance-region) calls
+    # instead of a linear scan.
     if alternative == "lower" and x > 0:
-        ci_low = x
-        tail = hypergeom.sf(x - 1, N, ci_low, n)
-        while tail < (1 - cl):
-            ci_low += 1
-            tail = hypergeom.sf(x - 1, N, ci_low, n)
+        ci_low = _bisect_least(x, N,
+                               lambda G: hypergeom.sf(x - 1, N, G, n)
+                               >= (1 - cl))
 
     if alternative == "upper" and x < n:
-        tail = hypergeom.sf(x, N, ci_upp, n)
-        while tail > cl:
-            ci_upp -= 1
-            tail = hypergeom.sf(x, N, ci_upp, n)
+        if hypergeom.sf(x, N, N, n) <= cl:
+            ci_upp = N
+        else:
+            ci_upp = _bisect_least(0, N,
+                                   lambda G: hypergeom.sf(x, N, G, n)
+                                   > cl) - 1
 
     if alternative == 'two-sided':
         cl = 1 - (1 - cl) / 2
-        eps = 0.1
+        # The confidence set is {G : x in accept(G)}; its endpoints are
+        # where the acceptance region's upper (resp. lower) end crosses x,
+        # and those are monotone in G. G is an integer count, so bisect on
+        # integers directly - the old 0.1-step scan evaluated the
+        # hypergeometric pmf at fractional G, where it is undefined.
         if x > 0:
-            while x not in hypergeom_accept(N, ci_low, n, cl, randomized=False):
-                ci_low += eps
-            ci_low -= eps
-            ci_low = round(ci_low)
+            ci_low = _bisect_least(
+                0, N,
+                lambda G: x <= max(hypergeom_accept(N, G, n, cl,
+                                                    randomized=False)))
         if x < n:
-            while x not in hypergeom_accept(N, ci_upp, n, cl, randomized=False):
-                ci_upp -= eps
-            ci_upp += eps
-            ci_upp = round(ci_upp)
+            ci_upp = N - _bisect_least(
+                0, N,
+                lambda G: x >= min(hypergeom_accept(N, N - G, n, cl,
+                                                    randomized=False)))
 
     return ci_low, ci_upp
\ No newline at end of file
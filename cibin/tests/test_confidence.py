@@ -35,13 +35,25 @@ def test_tau_twosided_ci_2():
     assert(a == c)
 
 
+def test_tau_twosided_ci_3():
+    """tau_twosided_ci test.
+
+    Tests that exact='auto' picks the exact enumeration
+    when there are fewer possible samples than reps
+    """
+    bounds1, a, b = tau_twosided_ci(1, 1, 2, 0, 0.05, 'auto')
+    bounds2, c, d = tau_twosided_ci(1, 1, 2, 0, 0.05, True)
+    assert(bounds1 == bounds2)
+    assert(a == c)
+
+
 def test_filterTable_1():
     """filterTable test.
 
     Tests legal inputs to filterTable
     function and checks for proper output.
     """
-    assert(!filterTable([5, 10, 10, 5], 6, 11, 10, 3))
+    assert(not filterTable([5, 10, 10, 5], 6, 11, 10, 3))
 
 
 def test_potential_outcomes_1():
@@ -50,7 +62,9 @@ def test_potential_outcomes_1():
     Tests legal inputs to potential_outcomes
     function and checks for proper output.
     """
-    assert(potential_outcomes([1, 0, 1, 0]).tolist() == [[0, 0], [1, 0]])
+    po_ctrl, po_trt = potential_outcomes([1, 0, 1, 0])
+    assert(po_ctrl.tolist() == [0, 1])
+    assert(po_trt.tolist() == [0, 0])
 
 
 def test_filterTable_badinput_2():